@@ -1,6 +1,9 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from urllib.request import urlopen
 from datetime import datetime, timedelta
 import time
 
@@ -24,19 +27,28 @@ st.set_page_config(
 # Replace with your GitHub details to fetch the self-harvested data
 GITHUB_USER = "YourGitHubUsername" # <--- CHANGE THIS
 GITHUB_REPO = "SwingLab-Pro-Next"  # <--- CHANGE THIS
-DATA_URL = f"https://raw.githubusercontent.com/{GITHUB_USER}/{GITHUB_REPO}/main/smart_db.csv"
+DATA_URL = f"https://raw.githubusercontent.com/{GITHUB_USER}/{GITHUB_REPO}/main/smart_db.parquet"
+
+# Only these columns are read from the Parquet file (column projection)
+NEEDED_COLS = ['SYMBOL', 'TIMESTAMP', 'OPEN', 'HIGH', 'LOW', 'CLOSE', 'TOTTRDQTY']
 
 # ==========================================
 # DATA LOADING (THE SMART HARVEST)
 # ==========================================
-@st.cache_data(ttl=3600) # Cache for 1 hour
+# cache_resource, not cache_data: the frame is kept by reference, so it is never
+# pickled into the cache or unpickled into fresh blocks on each rerun.
+@st.cache_resource(ttl=3600) # Cache for 1 hour, shared by reference (treat as read-only)
 def load_and_process_data():
     try:
         # Load the "Smart DB" harvested by GitHub Actions
-        df = pd.read_csv(DATA_URL)
-        df['TIMESTAMP'] = pd.to_datetime(df['TIMESTAMP'])
+        with urlopen(DATA_URL, timeout=30) as resp:
+            buf = pa.py_buffer(resp.read())
+        table = pq.read_table(pa.BufferReader(buf), columns=NEEDED_COLS)
+        # One standalone block per column, Arrow buffers freed as they convert
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+        del table
         
-        # Run the 19 Locked Signals
+        # Run the 19 Locked Signals (always on the full history)
         processed_df = run_signals(df)
         return processed_df
     except Exception as e:
@@ -78,14 +90,22 @@ if df is None:
     st.warning("⚠️ Waiting for first GitHub Harvest... Data will appear after 7:45 PM IST.")
     st.stop()
 
-# Filter by user volume preference
-df = df[df['TOTTRDQTY'] > min_vol]
+# Filter by user volume preference (display only: signals were computed on the full
+# history; positional mask, the cached frame is never touched)
+df = df.iloc[df['TOTTRDQTY'].to_numpy() > min_vol]
+
+# Direction masks, computed once per rerun from the Categorical codes
+sig = df['SIGNAL'].astype('category')
+buy_codes = [i for i, name in enumerate(sig.cat.categories) if 'Buy' in name]
+sell_codes = [i for i, name in enumerate(sig.cat.categories) if 'Sell' in name]
+is_buy = sig.cat.codes.isin(buy_codes).to_numpy()
+is_sell = sig.cat.codes.isin(sell_codes).to_numpy()
 
 # Top Metrics
 col1, col2, col3, col4 = st.columns(4)
 col1.metric("Stocks Scanned", f"{len(df['SYMBOL'].unique())}")
-col2.metric("Bullish Signals", f"{len(df[df['SIGNAL'].str.contains('Buy')])}")
-col3.metric("Bearish Signals", f"{len(df[df['SIGNAL'].str.contains('Sell')])}")
+col2.metric("Bullish Signals", f"{is_buy.sum()}")
+col3.metric("Bearish Signals", f"{is_sell.sum()}")
 col4.metric("User Tier", user_tier, delta="Active" if user_tier=="ELITE" else None)
 
 # ==========================================
@@ -122,7 +142,7 @@ def style_dataframe(data):
 
 with tab_bull:
     # Filter Bullish Signals
-    bull_df = df[df['SIGNAL'].str.contains('Buy')][['SYMBOL', 'CLOSE', 'STOP_LOSS', 'SIGNAL', 'TOTTRDQTY']]
+    bull_df = df.loc[is_buy, ['SYMBOL', 'CLOSE', 'STOP_LOSS', 'SIGNAL', 'TOTTRDQTY']]
     if not bull_df.empty:
         style_dataframe(bull_df)
     else:
@@ -130,7 +150,7 @@ with tab_bull:
 
 with tab_bear:
     # Filter Bearish Signals
-    bear_df = df[df['SIGNAL'].str.contains('Sell')][['SYMBOL', 'CLOSE', 'STOP_LOSS', 'SIGNAL', 'TOTTRDQTY']]
+    bear_df = df.loc[is_sell, ['SYMBOL', 'CLOSE', 'STOP_LOSS', 'SIGNAL', 'TOTTRDQTY']]
     if not bear_df.empty:
         style_dataframe(bear_df)
     else:
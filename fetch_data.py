@@ -1,9 +1,17 @@
-import yfinance as yf
+import asyncio
+import aiohttp
+import numpy as np
 import pandas as pd
 import requests
 import io
+import os
 import time
-from datetime import datetime
+from urllib.parse import quote
+
+# Yahoo chart endpoint (one request per symbol) and polite concurrency cap
+CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{}"
+MAX_CONCURRENCY = 8
+DB_PARQUET = "smart_db.parquet"
 
 def get_nifty500_symbols():
     """Fetch live Nifty 500 list from NSE."""
@@ -28,58 +36,152 @@ def get_nifty500_symbols():
             # (Add remaining top 100 manually if needed, but usually NSE link works)
         ]
 
-def harvest_data():
-    symbols = get_nifty500_symbols()
-    all_data = []
+async def fetch_one(session, sym, sem, start=None):
+    """Fetch one symbol's daily chart JSON from Yahoo (bounded by the semaphore).
+    With a start date only bars from that day on are requested, otherwise 1 year."""
+    if start is None:
+        params = {'range': '1y', 'interval': '1d'}
+    else:
+        params = {'period1': int(start.timestamp()), 'period2': int(time.time()), 'interval': '1d'}
+    async with sem:
+        try:
+            url = CHART_URL.format(quote(sym))
+            async with session.get(url, params=params) as r:
+                if r.status != 200:
+                    print(f"   ⚠️ {sym}: HTTP {r.status}")
+                    return sym, None
+                return sym, await r.json()
+        except Exception as e:
+            print(f"   ⚠️ {sym}: {e}")
+            return sym, None
+
+async def fetch_all(symbols, starts=None):
+    """Fetch every symbol concurrently over one HTTP session (starts: SYMBOL -> first date)."""
+    starts = starts or {}
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    timeout = aiohttp.ClientTimeout(total=30)
+    async with aiohttp.ClientSession(headers={'User-Agent': 'Mozilla/5.0'}, timeout=timeout) as session:
+        return await asyncio.gather(*[fetch_one(session, sym, sem, starts.get(sym.replace(".NS", ""))) for sym in symbols])
+
+def parse_chart(payload):
+    """Turn a chart JSON payload into Smart DB column arrays (split/dividend adjusted, like yfinance).
+    Returns None when the payload has no bars."""
+    result = (payload.get('chart') or {}).get('result')
+    if not result or not result[0].get('timestamp'):
+        return None
+    result = result[0]
     
-    print(f"🚀 STARTING HARVEST: {len(symbols)} Stocks...")
+    q = result['indicators']['quote'][0]
+    opn, high, low, close, vol = (np.array(q[k], dtype=float) for k in ['open', 'high', 'low', 'close', 'volume'])
     
-    # Batch download to avoid blocking (25 stocks per batch)
-    batch_size = 25
-    for i in range(0, len(symbols), batch_size):
-        batch = symbols[i:i+batch_size]
-        print(f"   📦 Batch {i//batch_size + 1}: {batch[0]} ... {batch[-1]}")
-        
+    # Scale OHLC by adjclose/close (yfinance auto_adjust)
+    adj = result['indicators'].get('adjclose', [{}])[0].get('adjclose')
+    if adj is not None:
+        ratio = np.array(adj, dtype=float) / close
+        opn, high, low, close = opn * ratio, high * ratio, low * ratio, close * ratio
+    
+    # Bar timestamps are UTC; shift to exchange time before taking the date
+    ts = np.array(result['timestamp'], dtype=np.int64) + result['meta'].get('gmtoffset', 0)
+    dates = ts.astype('datetime64[s]').astype('datetime64[D]').astype('datetime64[ns]')
+    
+    return {'TIMESTAMP': dates, 'OPEN': opn, 'HIGH': high, 'LOW': low, 'CLOSE': close, 'TOTTRDQTY': vol}
+
+def columns_to_frame(parsed):
+    """Build one DataFrame from {SYMBOL: column arrays} with a single concatenate per column."""
+    names = list(parsed)
+    sizes = [len(parsed[name]['TIMESTAMP']) for name in names]
+    frame = {'SYMBOL': np.repeat(np.array(names, dtype=object), sizes)}
+    for c in ['TIMESTAMP', 'OPEN', 'HIGH', 'LOW', 'CLOSE', 'TOTTRDQTY']:
+        frame[c] = np.concatenate([parsed[name][c] for name in names])
+    return pd.DataFrame(frame)
+
+def load_existing_db():
+    """Previous harvest (if any), used to fetch only the bars added since."""
+    if not os.path.exists(DB_PARQUET):
+        return None
+    try:
+        return pd.read_parquet(DB_PARQUET)
+    except Exception as e:
+        print(f"⚠️ Could not read {DB_PARQUET} ({e}). Doing a full harvest.")
+        return None
+
+def parse_results(results):
+    """Parse fetch results into {SYMBOL: column arrays}, skipping failures."""
+    parsed = {}
+    for sym, payload in results:
+        if payload is None: continue
         try:
-            # Download with threads
-            data = yf.download(batch, period="1y", group_by='ticker', threads=True, progress=False)
-            
-            # Process
-            for sym in batch:
-                try:
-                    if len(batch) == 1: df = data.copy()
-                    else: df = data[sym].copy() if sym in data else pd.DataFrame()
-                    
-                    if df.empty: continue
-                    
-                    df = df.reset_index()
-                    df['SYMBOL'] = sym.replace(".NS", "")
-                    
-                    # Fix Column Names
-                    df.columns = [c[0] if isinstance(c, tuple) else c for c in df.columns]
-                    df = df.rename(columns={"Date":"TIMESTAMP", "Open":"OPEN", "High":"HIGH", "Low":"LOW", "Close":"CLOSE", "Volume":"TOTTRDQTY"})
-                    
-                    # Essential Columns Only
-                    cols = ['SYMBOL', 'TIMESTAMP', 'OPEN', 'HIGH', 'LOW', 'CLOSE', 'TOTTRDQTY']
-                    if all(c in df.columns for c in cols):
-                        all_data.append(df[cols])
-                        
-                except: continue
-            
-            # PAUSE to be polite to Yahoo server
-            time.sleep(2) 
-            
+            cols = parse_chart(payload)
+            if cols is not None:
+                parsed[sym.replace(".NS", "")] = cols
         except Exception as e:
-            print(f"   ⚠️ Batch Error: {e}")
+            print(f"   ⚠️ {sym}: Parse Error: {e}")
+    return parsed
 
-    if all_data:
-        final_df = pd.concat(all_data)
+def harvest_data():
+    symbols = get_nifty500_symbols()
+    names = [sym.replace(".NS", "") for sym in symbols]
+    
+    # Incremental mode: re-fetch each symbol from its last stored bar onwards
+    existing = load_existing_db()
+    last_bars = {}
+    if existing is not None:
+        existing = existing[existing['SYMBOL'].isin(names)]
+        last_rows = existing.sort_values('TIMESTAMP').groupby('SYMBOL', observed=True).tail(1)
+        last_bars = {str(r.SYMBOL): (r.TIMESTAMP, r.CLOSE) for r in last_rows.itertuples()}
+    starts = {name: ts for name, (ts, _) in last_bars.items()}
+    
+    print(f"🚀 STARTING HARVEST: {len(symbols)} Stocks ({len(starts)} incremental, {MAX_CONCURRENCY} concurrent)...")
+    parsed = parse_results(asyncio.run(fetch_all(symbols, starts)))
+    
+    # The last stored bar is fetched again as an overlap check. If its adjusted
+    # close moved (split / dividend), the stored history is stale: re-fetch 1y.
+    stale = []
+    for name, cols in parsed.items():
+        if name not in last_bars: continue
+        ts, close = last_bars[name]
+        overlap = cols['CLOSE'][cols['TIMESTAMP'] == np.datetime64(ts, 'ns')]
+        if len(overlap) == 0 or not np.isclose(overlap[0], close, rtol=1e-4):
+            stale.append(name)
+    if stale:
+        print(f"   🔁 Adjusted history changed for {len(stale)} stocks. Re-fetching 1y...")
+        refetched = parse_results(asyncio.run(fetch_all([name + ".NS" for name in stale])))
+        parsed.update(refetched)
+        existing = existing[~existing['SYMBOL'].isin(list(refetched))]
+        # Re-fetch failed: keep the stored (consistent) history, retry next run
+        for name in stale:
+            if name not in refetched:
+                parsed.pop(name, None)
+    
+    if parsed:
+        final_df = columns_to_frame(parsed)
+        if existing is not None:
+            final_df = pd.concat([existing.astype({'SYMBOL': str}), final_df], ignore_index=True)
+        
+        # New bars replace stored ones for the same day; keep a rolling 1y window
+        final_df = final_df.drop_duplicates(subset=['SYMBOL', 'TIMESTAMP'], keep='last')
+        cutoff = pd.Timestamp.today().normalize() - pd.DateOffset(years=1)
+        final_df = final_df[final_df['TIMESTAMP'] >= cutoff]
+        final_df = final_df.sort_values(['SYMBOL', 'TIMESTAMP'], ignore_index=True)
+        
         # Force Numeric
         for c in ['OPEN', 'HIGH', 'LOW', 'CLOSE', 'TOTTRDQTY']:
             final_df[c] = pd.to_numeric(final_df[c], errors='coerce')
+        
+        # Narrow dtypes: float32 prices, int32 volume, categorical SYMBOL.
+        # Bars Yahoo padded with NaN (holidays / suspensions) carry no data.
+        final_df = final_df.dropna(subset=['OPEN', 'HIGH', 'LOW', 'CLOSE', 'TOTTRDQTY'])
+        for c in ['OPEN', 'HIGH', 'LOW', 'CLOSE']:
+            final_df[c] = final_df[c].astype('float32')
+        vol_fits_int32 = final_df['TOTTRDQTY'].max() <= np.iinfo(np.int32).max
+        final_df['TOTTRDQTY'] = final_df['TOTTRDQTY'].astype('int32' if vol_fits_int32 else 'int64')
+        final_df['SYMBOL'] = final_df['SYMBOL'].astype('category')
             
         final_df.to_csv("smart_db.csv", index=False)
-        print(f"🎉 SUCCESS: Harvested {len(final_df)} rows. Saved to smart_db.csv")
+        
+        # Typed binary copy for the app (no CSV parsing / date coercion on load)
+        final_df.to_parquet(DB_PARQUET, compression='zstd', index=False)
+        print(f"🎉 SUCCESS: Harvested {len(final_df)} rows. Saved to smart_db.csv + smart_db.parquet")
     else:
         print("❌ FAILED: No data harvested.")
         exit(1)
@@ -1,42 +1,108 @@
 import pandas as pd
 import numpy as np
+import bottleneck as bn
+from numba import njit, prange
+
+# Daily signal names, indexed by SIGNAL_CODE - 1 (code 0 means no signal).
+SIGNAL_NAMES = [
+    'U-Turn (Buy)', 'U-Turn (Sell)',
+    'Jump Start (Buy)', 'Jump Start (Sell)',
+    'Full Stop (Buy)', 'Full Stop (Sell)',
+    'Turn Around (Buy)', 'Turn Around (Sell)',
+    'Reverse (Buy)',
+    'Gap (Buy)',
+    'Volume Spike',
+]
+
+# Direction of each daily signal (+1 Buy, -1 Sell, 0 neither), same order as SIGNAL_NAMES.
+SIGNAL_DIR = np.array([+1, -1, +1, -1, +1, -1, +1, -1, +1, +1, 0], dtype=np.int8)
+
+# Weekly signal names; run_signals returns SIGNAL as a Categorical over both lists.
+WEEKLY_SIGNAL_NAMES = ['Weekly Reversal (Buy)', '3-Week Reversal (Buy)']
+
+def _group_starts(symbols):
+    """
+    Row positions where a new symbol begins. Input must be sorted by SYMBOL.
+    """
+    codes = pd.factorize(symbols)[0]
+    return np.r_[0, np.flatnonzero(np.diff(codes)) + 1]
+
+def _group_positions(n, starts):
+    """
+    Position of every row within its own symbol (0 for the first bar).
+    """
+    sizes = np.diff(np.r_[starts, n])
+    return np.arange(n) - np.repeat(starts, sizes)
+
+def _group_shift(arr, starts, periods=1):
+    """
+    Per-symbol shift on a flat sorted array (same as groupby(...).shift(periods)).
+    One memcpy for the whole column, then only the first `periods` bars of
+    each symbol are set to NaN.
+    """
+    out = np.empty(len(arr), dtype=np.result_type(arr.dtype, np.float32))
+    out[periods:] = arr[:-periods]
+    ends = np.r_[starts[1:], len(arr)]
+    for k in range(periods):
+        first = starts + k
+        out[first[first < ends]] = np.nan
+    return out
+
+def _group_rolling(arr, starts, window, move_fn):
+    """
+    Per-symbol rolling window using a bottleneck move_* kernel.
+    Runs once over the whole array, then blanks the first window-1 bars of
+    each symbol, whose windows would otherwise spill into the previous symbol.
+    """
+    if window > len(arr):
+        # No symbol can fill the window (bottleneck would raise here)
+        return np.full(len(arr), np.nan)
+    out = move_fn(arr, window)
+    out[_group_positions(len(arr), starts) < window - 1] = np.nan
+    return out
 
 def prepare_data(df):
     """
     Pre-processes the Smart DB data.
     CRITICAL FIX: Resets index after sorting to prevent alignment errors.
+    The caller's frame is never modified (the app shares it across reruns).
     """
+    df = df.copy(deep=False)
+    
     # Standardize Date
     df['DATE'] = pd.to_datetime(df['TIMESTAMP'], utc=True)
     
     # Sort and RESET INDEX to ensure row numbers match 0,1,2,3...
     df = df.sort_values(by=['SYMBOL', 'DATE']).reset_index(drop=True)
     
-    # Group by Symbol
-    g = df.groupby('SYMBOL')
+    # Group boundaries (rows are sorted by SYMBOL, so each symbol is one slice)
+    starts = _group_starts(df['SYMBOL'])
+    
+    OPEN = df['OPEN'].to_numpy(); HIGH = df['HIGH'].to_numpy(); LOW = df['LOW'].to_numpy()
+    CLOSE = df['CLOSE'].to_numpy(); VOL = df['TOTTRDQTY'].to_numpy()
     
     # --- SHIFTS (Previous Day) ---
-    df['PDO'] = g['OPEN'].shift(1)
-    df['PDH'] = g['HIGH'].shift(1)
-    df['PDL'] = g['LOW'].shift(1)
-    df['PDC'] = g['CLOSE'].shift(1)
-    df['PD_VOL'] = g['TOTTRDQTY'].shift(1)
+    df['PDO'] = _group_shift(OPEN, starts)
+    df['PDH'] = _group_shift(HIGH, starts)
+    df['PDL'] = _group_shift(LOW, starts)
+    df['PDC'] = _group_shift(CLOSE, starts)
+    df['PD_VOL'] = _group_shift(VOL, starts)
     
     # --- AVERAGES & ROLLING ---
-    df['AVG_VOL_5'] = g['TOTTRDQTY'].rolling(5).mean()
-    df['AVG_VOL_10'] = g['TOTTRDQTY'].rolling(10).mean()
-    df['AVG_VOL_90'] = g['TOTTRDQTY'].rolling(90).mean()
+    df['AVG_VOL_5'] = _group_rolling(VOL, starts, 5, bn.move_mean)
+    df['AVG_VOL_10'] = _group_rolling(VOL, starts, 10, bn.move_mean)
+    df['AVG_VOL_90'] = _group_rolling(VOL, starts, 90, bn.move_mean)
     
-    df['MIN_LOW_1W'] = g['LOW'].rolling(5).min()
-    df['MIN_LOW_2W'] = g['LOW'].rolling(10).min()
-    df['MIN_LOW_4W'] = g['LOW'].rolling(20).min()
-    df['MIN_LOW_6W'] = g['LOW'].rolling(30).min()
+    df['MIN_LOW_1W'] = _group_rolling(LOW, starts, 5, bn.move_min)
+    df['MIN_LOW_2W'] = _group_rolling(LOW, starts, 10, bn.move_min)
+    df['MIN_LOW_4W'] = _group_rolling(LOW, starts, 20, bn.move_min)
+    df['MIN_LOW_6W'] = _group_rolling(LOW, starts, 30, bn.move_min)
     
-    df['MAX_HIGH_1W'] = g['HIGH'].rolling(5).max()
-    df['MAX_HIGH_2W'] = g['HIGH'].rolling(10).max()
-    df['MAX_HIGH_3W'] = g['HIGH'].rolling(15).max()
-    df['MAX_HIGH_6W'] = g['HIGH'].rolling(30).max()
-    df['MAX_HIGH_10W'] = g['HIGH'].rolling(50).max()
+    df['MAX_HIGH_1W'] = _group_rolling(HIGH, starts, 5, bn.move_max)
+    df['MAX_HIGH_2W'] = _group_rolling(HIGH, starts, 10, bn.move_max)
+    df['MAX_HIGH_3W'] = _group_rolling(HIGH, starts, 15, bn.move_max)
+    df['MAX_HIGH_6W'] = _group_rolling(HIGH, starts, 30, bn.move_max)
+    df['MAX_HIGH_10W'] = _group_rolling(HIGH, starts, 50, bn.move_max)
     
     return df
 
@@ -44,140 +110,178 @@ def resample_to_weekly(daily_df):
     """
     Converts Daily data to Weekly for Signals 11-14.
     """
-    # Ensure DATE is index for resampling
-    temp = daily_df.set_index('DATE').copy()
+    # Bars with missing prices carry nothing into the weekly candle
+    ohlcv = ['OPEN', 'HIGH', 'LOW', 'CLOSE', 'TOTTRDQTY']
+    daily_df = daily_df[daily_df[ohlcv].notna().all(axis=1).to_numpy()]
+    if len(daily_df) == 0:
+        return pd.DataFrame(columns=['SYMBOL', 'DATE', 'TWO', 'TWH', 'TWL', 'TWC', 'TOTTRDQTY',
+                                     'PWO', 'PWH', 'PWL', 'PWC', 'QWO', 'QWH', 'QWL', 'QWC',
+                                     'WK_LOW_7W', 'WK_HIGH_5W', 'WK_HIGH_10W'])
+    
+    # W-FRI bucket: weeks run Saturday..Friday (1970-01-03 was a Saturday)
+    days = daily_df['DATE'].dt.tz_localize(None).to_numpy().astype('datetime64[D]').astype(np.int64)
+    week = (days - 2) // 7
+    
+    # Input is sorted by SYMBOL, DATE so every (symbol, week) is one contiguous run
+    codes = pd.factorize(daily_df['SYMBOL'])[0].astype(np.int64)
+    key = (codes << 32) | week
+    edges = np.flatnonzero(np.diff(key)) + 1
+    starts = np.r_[0, edges]
+    ends = np.r_[edges - 1, len(key) - 1]
     
-    weekly = temp.groupby('SYMBOL').resample('W-FRI').agg({
-        'OPEN': 'first',
-        'HIGH': 'max',
-        'LOW': 'min',
-        'CLOSE': 'last',
-        'TOTTRDQTY': 'sum'
-    }).dropna().reset_index()
+    weekly = pd.DataFrame({
+        'SYMBOL': daily_df['SYMBOL'].array[starts],
+        'DATE': pd.to_datetime((week[starts] * 7 + 8).astype('datetime64[D]'), utc=True),
+        'OPEN': daily_df['OPEN'].to_numpy()[starts],
+        'HIGH': np.maximum.reduceat(daily_df['HIGH'].to_numpy(), starts),
+        'LOW': np.minimum.reduceat(daily_df['LOW'].to_numpy(), starts),
+        'CLOSE': daily_df['CLOSE'].to_numpy()[ends],
+        'TOTTRDQTY': np.add.reduceat(daily_df['TOTTRDQTY'].to_numpy(), starts, dtype=np.float64),
+    })
     
     # Renaming for Weekly Logic
     weekly = weekly.rename(columns={'OPEN': 'TWO', 'HIGH': 'TWH', 'LOW': 'TWL', 'CLOSE': 'TWC'})
     
-    wg = weekly.groupby('SYMBOL')
-    weekly['PWO'] = wg['TWO'].shift(1)
-    weekly['PWH'] = wg['TWH'].shift(1)
-    weekly['PWL'] = wg['TWL'].shift(1)
-    weekly['PWC'] = wg['TWC'].shift(1)
+    wk_starts = _group_starts(weekly['SYMBOL'])
+    TWO = weekly['TWO'].to_numpy(); TWH = weekly['TWH'].to_numpy()
+    TWL = weekly['TWL'].to_numpy(); TWC = weekly['TWC'].to_numpy()
     
-    weekly['QWO'] = wg['TWO'].shift(2)
-    weekly['QWH'] = wg['TWH'].shift(2)
-    weekly['QWL'] = wg['TWL'].shift(2)
-    weekly['QWC'] = wg['TWC'].shift(2)
+    weekly['PWO'] = _group_shift(TWO, wk_starts, 1)
+    weekly['PWH'] = _group_shift(TWH, wk_starts, 1)
+    weekly['PWL'] = _group_shift(TWL, wk_starts, 1)
+    weekly['PWC'] = _group_shift(TWC, wk_starts, 1)
     
-    weekly['WK_LOW_7W'] = wg['TWL'].rolling(7).min()
-    weekly['WK_HIGH_5W'] = wg['TWH'].rolling(5).min()
-    weekly['WK_HIGH_10W'] = wg['TWH'].rolling(10).max()
+    weekly['QWO'] = _group_shift(TWO, wk_starts, 2)
+    weekly['QWH'] = _group_shift(TWH, wk_starts, 2)
+    weekly['QWL'] = _group_shift(TWL, wk_starts, 2)
+    weekly['QWC'] = _group_shift(TWC, wk_starts, 2)
+    
+    weekly['WK_LOW_7W'] = _group_rolling(TWL, wk_starts, 7, bn.move_min)
+    weekly['WK_HIGH_5W'] = _group_rolling(TWH, wk_starts, 5, bn.move_min)
+    weekly['WK_HIGH_10W'] = _group_rolling(TWH, wk_starts, 10, bn.move_max)
     
     return weekly
 
-def run_signals(df):
+@njit(parallel=True, cache=True)
+def _daily_signal_kernel(TDO, TDH, TDL, TDC, VOL, PDO, PDH, PDL, PDC, PD_VOL,
+                         AVG_VOL_5, AVG_VOL_10, AVG_VOL_90,
+                         MIN_LOW_1W, MIN_LOW_4W, MAX_HIGH_1W, MAX_HIGH_3W, MAX_HIGH_10W,
+                         MIN_LOW_2W, MAX_HIGH_2W, MIN_LOW_6W, MAX_HIGH_6W):
     """
-    Executes the 19 Locked Signals.
+    Evaluates the daily signals row by row and returns an int8 SIGNAL_CODE
+    array (index into SIGNAL_NAMES + 1, 0 = no signal).
+    Signals are checked last-to-first so a later signal wins when several match.
+    "Previous bar" windows (X.shift(1), X.rolling(3).max()) are read at i-1 / i-2
+    directly instead of being materialised as shifted copies.
+    NaN inputs compare False, exactly like the pandas masks (no fastmath).
     """
-    # 1. Prepare Daily Data
-    df = prepare_data(df)
-    
-    # 2. Aliases for Signals
-    TDO = df['OPEN']; TDC = df['CLOSE']; TDL = df['LOW']; TDH = df['HIGH']; VOL = df['TOTTRDQTY']
-    PDO = df['PDO']; PDC = df['PDC']; PDL = df['PDL']; PDH = df['PDH']; PD_VOL = df['PD_VOL']
-    
-    # 3. Initialize Signal Column
-    df['SIGNAL'] = None 
-    
-    # --- SIGNALS LOGIC ---
-    
-    # 1. U TURN (BUY)
-    mask_s1 = (
-        (TDC > PDC * 1.0015) & (TDO < PDL * 0.9975) & (TDC > PDO) &
-        (TDL <= df['MIN_LOW_4W']) & (VOL > PD_VOL * 1.20)
-    )
-    df.loc[mask_s1, 'SIGNAL'] = 'U-Turn (Buy)'
-
-    # 2. U TURN (SELL)
-    mask_s2 = (
-        (TDC < PDC * 0.9985) & (TDO > PDH * 1.0015) & (TDC < PDO) &
-        (TDH >= df['MAX_HIGH_3W']) & (TDC > 2) & (VOL > PD_VOL * 1.20) & (VOL > 500000)
-    )
-    df.loc[mask_s2, 'SIGNAL'] = 'U-Turn (Sell)'
-
-    # 3. JUMP START (BUY)
-    mask_s3 = (
-        (TDO > PDH * 1.0010) & (TDC > TDO) & (PDL <= df['MIN_LOW_2W'].shift(1)) &
-        (TDL > PDH) & (TDH < df['MAX_HIGH_10W'] * 0.97) & (VOL > PD_VOL) & (VOL > 500000)
-    )
-    df.loc[mask_s3, 'SIGNAL'] = 'Jump Start (Buy)'
-
-    # 4. JUMP START (SELL)
-    mask_s4 = (
-        (TDO < PDL * 0.9990) & (TDC < TDO) & (PDH >= df['MAX_HIGH_2W'].shift(1)) &
-        (TDH < PDL) & (df['AVG_VOL_10'] > 100000) & (TDC > 5) & (VOL > PD_VOL)
-    )
-    df.loc[mask_s4, 'SIGNAL'] = 'Jump Start (Sell)'
-
-    # 5. FULL STOP (BUY)
-    mask_s5 = (
-        (TDL > PDC * 1.0010) & (PDH > TDL) & (TDC > TDO) & (TDC > PDH) &
-        (PDL <= df['MIN_LOW_6W'].shift(1)) & (VOL > PD_VOL) & (VOL > 500000)
-    )
-    df.loc[mask_s5, 'SIGNAL'] = 'Full Stop (Buy)'
-
-    # 6. FULL STOP (SELL)
-    mask_s6 = (
-        (TDH < PDC * 0.9990) & (PDL < TDH) & (TDC < TDO) &
-        (PDH >= df['MAX_HIGH_6W'].shift(1)) & (VOL > PD_VOL) & (VOL > 500000)
-    )
-    df.loc[mask_s6, 'SIGNAL'] = 'Full Stop (Sell)'
-
-    # 7. TURN AROUND (BUY)
-    mask_s7 = (
-        (TDO < PDL) & (TDC > PDC) & (TDL == df['MIN_LOW_1W']) & (VOL > df['AVG_VOL_5'])
-    )
-    df.loc[mask_s7, 'SIGNAL'] = 'Turn Around (Buy)'
-
-    # 8. TURN AROUND (SELL)
-    mask_s8 = (
-        (TDH == df['MAX_HIGH_1W']) & (TDO > PDH) & (TDC < PDC) & (VOL > df['AVG_VOL_5'])
-    )
-    df.loc[mask_s8, 'SIGNAL'] = 'Turn Around (Sell)'
-
-    # 9. REVERSE (BUY)
-    mask_s9 = (
-        (TDC > PDC * 1.002) & (TDL == df['MIN_LOW_1W']) & (TDL < PDL * 0.9925) &
-        (TDC > TDO * 1.002) & (VOL > df['AVG_VOL_5'] * 1.20) & (VOL > 500000)
-    )
-    df.loc[mask_s9, 'SIGNAL'] = 'Reverse (Buy)'
-
-    # 15. GAP (BUY)
-    mask_s15 = (
-        (TDL > PDH * 1.01) & (TDC > TDO) & (VOL == df['TOTTRDQTY'].rolling(3).max()) &
-        (df['AVG_VOL_10'] > 200000) & (TDC > 40)
-    )
-    df.loc[mask_s15, 'SIGNAL'] = 'Gap (Buy)'
+    n = len(TDC)
+    out = np.zeros(n, dtype=np.int8)
+    for i in prange(n):
+        tdo = TDO[i]; tdh = TDH[i]; tdl = TDL[i]; tdc = TDC[i]; vol = VOL[i]
+        pdo = PDO[i]; pdh = PDH[i]; pdl = PDL[i]; pdc = PDC[i]; pd_vol = PD_VOL[i]
+        
+        # Yesterday's N-week extremes (NaN on the very first row, like shift(1))
+        if i > 0:
+            prev_min_low_2w = MIN_LOW_2W[i - 1]; prev_max_high_2w = MAX_HIGH_2W[i - 1]
+            prev_min_low_6w = MIN_LOW_6W[i - 1]; prev_max_high_6w = MAX_HIGH_6W[i - 1]
+        else:
+            prev_min_low_2w = np.nan; prev_max_high_2w = np.nan
+            prev_min_low_6w = np.nan; prev_max_high_6w = np.nan
+        
+        # 18. VOLUME SPIKE
+        if ((i >= 2) and (pd_vol > VOL[i - 2] * 4.0) and (vol < pd_vol * 0.75) and
+                (AVG_VOL_90[i] > 200000) and (tdc >= 5) and (tdc <= 250)):
+            out[i] = 11
+        
+        # 15. GAP (BUY)
+        # (vol == rolling(3).max() <=> vol is >= both previous bars)
+        elif ((tdl > pdh * 1.01) and (tdc > tdo) and
+                (i >= 2) and (vol >= VOL[i - 1]) and (vol >= VOL[i - 2]) and
+                (AVG_VOL_10[i] > 200000) and (tdc > 40)):
+            out[i] = 10
+        
+        # 9. REVERSE (BUY)
+        elif ((tdc > pdc * 1.002) and (tdl == MIN_LOW_1W[i]) and (tdl < pdl * 0.9925) and
+                (tdc > tdo * 1.002) and (vol > AVG_VOL_5[i] * 1.20) and (vol > 500000)):
+            out[i] = 9
+        
+        # 8. TURN AROUND (SELL)
+        elif (tdh == MAX_HIGH_1W[i]) and (tdo > pdh) and (tdc < pdc) and (vol > AVG_VOL_5[i]):
+            out[i] = 8
+        
+        # 7. TURN AROUND (BUY)
+        elif (tdo < pdl) and (tdc > pdc) and (tdl == MIN_LOW_1W[i]) and (vol > AVG_VOL_5[i]):
+            out[i] = 7
+        
+        # 6. FULL STOP (SELL)
+        elif ((tdh < pdc * 0.9990) and (pdl < tdh) and (tdc < tdo) and
+                (pdh >= prev_max_high_6w) and (vol > pd_vol) and (vol > 500000)):
+            out[i] = 6
+        
+        # 5. FULL STOP (BUY)
+        elif ((tdl > pdc * 1.0010) and (pdh > tdl) and (tdc > tdo) and (tdc > pdh) and
+                (pdl <= prev_min_low_6w) and (vol > pd_vol) and (vol > 500000)):
+            out[i] = 5
+        
+        # 4. JUMP START (SELL)
+        elif ((tdo < pdl * 0.9990) and (tdc < tdo) and (pdh >= prev_max_high_2w) and
+                (tdh < pdl) and (AVG_VOL_10[i] > 100000) and (tdc > 5) and (vol > pd_vol)):
+            out[i] = 4
+        
+        # 3. JUMP START (BUY)
+        elif ((tdo > pdh * 1.0010) and (tdc > tdo) and (pdl <= prev_min_low_2w) and
+                (tdl > pdh) and (tdh < MAX_HIGH_10W[i] * 0.97) and (vol > pd_vol) and (vol > 500000)):
+            out[i] = 3
+        
+        # 2. U TURN (SELL)
+        elif ((tdc < pdc * 0.9985) and (tdo > pdh * 1.0015) and (tdc < pdo) and
+                (tdh >= MAX_HIGH_3W[i]) and (tdc > 2) and (vol > pd_vol * 1.20) and (vol > 500000)):
+            out[i] = 2
+        
+        # 1. U TURN (BUY)
+        elif ((tdc > pdc * 1.0015) and (tdo < pdl * 0.9975) and (tdc > pdo) and
+                (tdl <= MIN_LOW_4W[i]) and (vol > pd_vol * 1.20)):
+            out[i] = 1
+    return out
 
-    # 18. VOLUME SPIKE
-    prev_vol_spike = (PD_VOL > df['TOTTRDQTY'].shift(2) * 4.0)
-    mask_s18 = (
-        prev_vol_spike & (VOL < PD_VOL * 0.75) & (df['AVG_VOL_90'] > 200000) & (TDC.between(5, 250))
+def _daily_signals(df):
+    """
+    Daily signals (1-9, 15, 18) on the prepared frame, with stop loss.
+    """
+    # Run all daily signals in one fused pass over contiguous arrays
+    codes = _daily_signal_kernel(
+        df['OPEN'].to_numpy(), df['HIGH'].to_numpy(), df['LOW'].to_numpy(),
+        df['CLOSE'].to_numpy(), df['TOTTRDQTY'].to_numpy(),
+        df['PDO'].to_numpy(), df['PDH'].to_numpy(), df['PDL'].to_numpy(),
+        df['PDC'].to_numpy(), df['PD_VOL'].to_numpy(),
+        df['AVG_VOL_5'].to_numpy(), df['AVG_VOL_10'].to_numpy(), df['AVG_VOL_90'].to_numpy(),
+        df['MIN_LOW_1W'].to_numpy(), df['MIN_LOW_4W'].to_numpy(),
+        df['MAX_HIGH_1W'].to_numpy(), df['MAX_HIGH_3W'].to_numpy(), df['MAX_HIGH_10W'].to_numpy(),
+        df['MIN_LOW_2W'].to_numpy(), df['MAX_HIGH_2W'].to_numpy(),
+        df['MIN_LOW_6W'].to_numpy(), df['MAX_HIGH_6W'].to_numpy(),
     )
-    df.loc[mask_s18, 'SIGNAL'] = 'Volume Spike'
 
-    # Filter Result
-    result = df[df['SIGNAL'].notna()].copy()
+    # Filter Result (only the display columns are copied out)
+    hit = codes != 0
+    codes = codes[hit] - 1
+    result = df.loc[hit, ['SYMBOL', 'CLOSE', 'TOTTRDQTY']]
     
-    # STOP LOSS CALCULATION
-    if not result.empty:
-        buy_sigs = result['SIGNAL'].str.contains('Buy')
-        result.loc[buy_sigs, 'STOP_LOSS'] = result['LOW'] * 0.995
-        result.loc[~buy_sigs, 'STOP_LOSS'] = result['HIGH'] * 1.005
+    # STOP LOSS CALCULATION (below the low for Buy, above the high otherwise)
+    is_buy = SIGNAL_DIR[codes] == 1
+    result.insert(2, 'STOP_LOSS', np.where(is_buy, df['LOW'].to_numpy()[hit] * 0.995,
+                                           df['HIGH'].to_numpy()[hit] * 1.005))
+    result.insert(3, 'SIGNAL', pd.Categorical.from_codes(codes, categories=SIGNAL_NAMES))
     
-    # --- WEEKLY MERGE ---
-    # We run weekly logic separately and append high-value signals
+    return result
+
+def _weekly_signals(df):
+    """
+    Weekly signals (11, 13), built from the already sorted daily frame.
+    """
     wk_df = resample_to_weekly(df)
+    if wk_df.empty:
+        return pd.DataFrame(columns=['SYMBOL', 'CLOSE', 'STOP_LOSS', 'SIGNAL', 'TOTTRDQTY'])
     
     # 11. WEEKLY REVERSAL
     mask_w11 = (
@@ -193,16 +297,30 @@ def run_signals(df):
     )
     wk_df.loc[mask_w13, 'SIGNAL'] = '3-Week Reversal (Buy)'
     
-    # Append Weekly signals to Daily results (keeping schema simple)
-    wk_signals = wk_df[wk_df['SIGNAL'].notna()].copy()
+    # Standardize columns for display
+    hit = wk_df['SIGNAL'].notna().to_numpy()
+    return pd.DataFrame({
+        'SYMBOL': wk_df['SYMBOL'].array[hit],
+        'CLOSE': wk_df['TWC'].to_numpy()[hit],
+        'STOP_LOSS': wk_df['TWL'].to_numpy()[hit] * 0.99,
+        'SIGNAL': wk_df['SIGNAL'].to_numpy()[hit],
+        'TOTTRDQTY': wk_df['TOTTRDQTY'].to_numpy()[hit],
+    })
+
+def run_signals(df):
+    """
+    Executes the 19 Locked Signals.
+    """
+    # 1. Prepare Daily Data (sorted once, shared by both engines)
+    df = prepare_data(df)
+    
+    # 2. Daily signals
+    result = _daily_signals(df)
+    
+    # 3. Weekly signals, appended to the daily results (keeping schema simple)
+    wk_signals = _weekly_signals(df)
     if not wk_signals.empty:
-        # Standardize columns for display
-        wk_signals = wk_signals.rename(columns={'TWC': 'CLOSE', 'TOTTRDQTY': 'TOTTRDQTY'})
-        wk_signals['STOP_LOSS'] = wk_signals['TWL'] * 0.99
-        wk_signals = wk_signals[['SYMBOL', 'CLOSE', 'STOP_LOSS', 'SIGNAL', 'TOTTRDQTY']]
-        
-        # Merge
-        final_cols = ['SYMBOL', 'CLOSE', 'STOP_LOSS', 'SIGNAL', 'TOTTRDQTY']
-        result = pd.concat([result[final_cols], wk_signals[final_cols]])
-        
+        result = pd.concat([result, wk_signals])
+    
+    result['SIGNAL'] = pd.Categorical(result['SIGNAL'], categories=SIGNAL_NAMES + WEEKLY_SIGNAL_NAMES)
     return result